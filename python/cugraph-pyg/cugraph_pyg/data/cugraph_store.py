@@ -11,14 +11,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Optional, Tuple, Any, Union, List
+from typing import Optional, Tuple, Any, Union, List, Iterable, Iterator
 from enum import Enum
 
-from dataclasses import dataclass
-from collections import defaultdict
-from itertools import chain
+from dataclasses import dataclass, fields
+from collections import defaultdict, deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, count
 from functools import cached_property
 
+import threading
 import warnings
 
 import numpy as np
@@ -54,6 +56,21 @@ class EdgeLayout(Enum):
     CSR = "csr"
 
 
+def _with_slots(cls):
+    """
+    Rebuilds a dataclass so that its fields are stored in __slots__
+    instead of a per-instance __dict__.  Equivalent to
+    @dataclass(slots=True), which requires Python 3.10.
+    """
+    field_names = tuple(f.name for f in fields(cls))
+    cls_dict = dict(cls.__dict__)
+    for name in field_names + ("__dict__", "__weakref__"):
+        cls_dict.pop(name, None)
+    cls_dict["__slots__"] = field_names
+    return type(cls)(cls.__name__, cls.__bases__, cls_dict)
+
+
+@_with_slots
 @dataclass
 class CuGraphEdgeAttr:
     r"""Defines the attributes of an :obj:`GraphStore` edge."""
@@ -100,7 +117,19 @@ class CuGraphEdgeAttr:
         return cls(*args, **kwargs)
 
 
-def EXPERIMENTAL__to_pyg(G, backend="torch", renumber_graph=None) -> Tuple:
+def _cast_attr(cls, *args, **kwargs):
+    """
+    Casts the arguments to an attr of class cls, returning a single
+    argument that is already an instance of cls as is.
+    """
+    if len(args) == 1 and len(kwargs) == 0 and isinstance(args[0], cls):
+        return args[0]
+    return cls.cast(*args, **kwargs)
+
+
+def EXPERIMENTAL__to_pyg(
+    G, backend="torch", renumber_graph=None, feature_cache_bytes=0
+) -> Tuple:
     """
         Returns the PyG wrappers for the provided PropertyGraph or
         MGPropertyGraph.
@@ -114,6 +143,9 @@ def EXPERIMENTAL__to_pyg(G, backend="torch", renumber_graph=None) -> Tuple:
         in the provided property graph will be renumbered so that they
         are contiguous by type.  If the vertices and edges are already
         contiguously renumbered by type, then this can be set to False.
+    feature_cache_bytes: int
+        The size in bytes of the cache of recently fetched feature
+        tensors.  Disabled if 0 (the default).
 
     Returns
     -------
@@ -121,7 +153,10 @@ def EXPERIMENTAL__to_pyg(G, backend="torch", renumber_graph=None) -> Tuple:
         Wrappers for the provided property graph.
     """
     store = EXPERIMENTAL__CuGraphStore(
-        G, backend=backend, renumber_graph=renumber_graph
+        G,
+        backend=backend,
+        renumber_graph=renumber_graph,
+        feature_cache_bytes=feature_cache_bytes,
     )
     return (store, store)
 
@@ -129,6 +164,7 @@ def EXPERIMENTAL__to_pyg(G, backend="torch", renumber_graph=None) -> Tuple:
 _field_status = Enum("FieldStatus", "UNSET")
 
 
+@_with_slots
 @dataclass
 class CuGraphTensorAttr:
     r"""Defines the attributes of a class:`FeatureStore` tensor; in particular,
@@ -168,7 +204,7 @@ class CuGraphTensorAttr:
 
     def is_fully_specified(self):
         r"""Whether the :obj:`TensorAttr` has no unset fields."""
-        return all([self.is_set(key) for key in self.__dataclass_fields__])
+        return all(self.is_set(key) for key in self.__dataclass_fields__)
 
     def fully_specify(self):
         r"""Sets all :obj:`UNSET` fields to :obj:`None`."""
@@ -206,12 +242,31 @@ class CuGraphTensorAttr:
         return cls(*args, **kwargs)
 
 
+def _vertex_type_numerals(vertex_ids: cudf.Series, vtype_stop: np.ndarray):
+    """
+    Returns the numeral of the vertex type of each of the given
+    (contiguously renumbered) vertex ids, given the inclusive
+    last vertex id of each vertex type.
+    """
+    return cudf.Series(
+        cupy.searchsorted(cupy.asarray(vtype_stop), vertex_ids.values),
+        index=vertex_ids.index,
+        dtype="int32",
+    )
+
+
 class EXPERIMENTAL__CuGraphStore:
     """
     Duck-typed version of PyG's GraphStore and FeatureStore.
     """
 
-    def __init__(self, G, backend: str = "torch", renumber_graph: bool = None):
+    def __init__(
+        self,
+        G,
+        backend: str = "torch",
+        renumber_graph: bool = None,
+        feature_cache_bytes: int = 0,
+    ):
         """
         Constructs a new CuGraphStore from the provided
         arguments.
@@ -228,44 +283,97 @@ class EXPERIMENTAL__CuGraphStore:
             If True, will renumber vertices and edges to have contiguous
             ids per type.  If False, will not renumber vertices.  If not
             specified, will renumber and raise a warning.
+        feature_cache_bytes : int
+            If positive, recently fetched feature tensors are kept on the
+            device, up to this many bytes, and returned again when the
+            same tensor is requested for an equal index.  Cached tensors
+            are shared between calls, so they should not be modified in
+            place.  Disabled if 0 (default = 0).
         """
 
         # FIXME ensure all x properties are float32 type
         # FIXME ensure y is of long type
-        if None in G.edge_types:
+        # The graph recomputes its edge and vertex type sets from the
+        # underlying (possibly distributed) data on every access, and
+        # neither changes for the life of this store, so look them up once.
+        self.__edge_types = list(G.edge_types)
+        self.__vertex_types = list(G.vertex_types)
+        self.__single_vertex_type = (
+            self.__vertex_types[0] if len(self.__vertex_types) == 1 else None
+        )
+
+        if None in self.__edge_types:
             raise ValueError("Unspecified edge types not allowed in PyG")
 
         # FIXME drop the cupy backend and remove these checks (#2995)
         if backend == "torch":
             from torch.utils.dlpack import from_dlpack
+            from torch import as_tensor as from_cuda_array
             from torch import int64 as vertex_dtype
+            from torch import int32 as compact_vertex_dtype
             from torch import float32 as property_dtype
             from torch import searchsorted as searchsorted
             from torch import concatenate as concatenate
             from torch import arange as arange
+            from torch import argsort as argsort
         elif backend == "cupy":
             from cupy import from_dlpack
+            from cupy import asarray as from_cuda_array
             from cupy import int64 as vertex_dtype
+            from cupy import int32 as compact_vertex_dtype
             from cupy import float32 as property_dtype
             from cupy import searchsorted as searchsorted
             from cupy import concatenate as concatenate
             from cupy import arange as arange
+            from cupy import argsort as argsort
         else:
             raise ValueError(f"Invalid backend {backend}.")
 
         self.__backend = backend
         self.from_dlpack = from_dlpack
+        # Zero-copy conversion of cudf series through the CUDA array
+        # interface, which avoids creating an intermediate DLPack capsule.
+        self.from_cuda_array = from_cuda_array
         self.vertex_dtype = vertex_dtype
+        self.compact_vertex_dtype = compact_vertex_dtype
         self.property_dtype = property_dtype
         self.searchsorted = searchsorted
         self.concatenate = concatenate
         self.arange = arange
+        self.argsort = argsort
 
         self.__graph = G
         self.__subgraphs = {}
 
+        # Brings delayed (dask) results onto a single device; does nothing
+        # for single-GPU graphs.  Resolved once rather than on every call.
+        if self._is_delayed:
+            self.__materialize = lambda df: df.compute()
+        else:
+            self.__materialize = lambda df: df
+        self.__edge_index_cache = {}
+
+        # token -> [index, {(group_name, attr_name, properties, dtype):
+        # tensor}, nbytes, bucket], in LRU order.  Each entry holds one copy
+        # of the index shared by all the tensors fetched for it.  Entries
+        # are also bucketed by (device, length, sum) of their index so a
+        # lookup only compares against indices that could be equal.  The
+        # lock guards the cache against the prefetch worker of
+        # iter_multi_get_tensor.
+        self.__feature_cache = OrderedDict()
+        self.__feature_cache_buckets = {}
+        self.__feature_cache_bytes = feature_cache_bytes
+        self.__feature_cache_used = 0
+        self.__feature_cache_tokens = count()
+        self.__feature_cache_lock = threading.Lock()
+
         self._tensor_attr_cls = CuGraphTensorAttr
         self._tensor_attr_dict = defaultdict(list)
+        # (group_name, attr_name) -> (properties, dtype) of the named
+        # tensor, or None if there is no such tensor
+        self._infer_cache = {}
+        # the number of attrs in _tensor_attr_dict
+        self._n_tensor_attrs = 0
         self.__infer_x_and_y_tensors()
 
         # Must be called after __infer_x_and_y_tensors to
@@ -273,44 +381,92 @@ class EXPERIMENTAL__CuGraphStore:
         # users do not specify it.
         self.__renumber_graph(renumber_graph)
 
-        self.__edge_types_to_attrs = {}
-        for edge_type in self.__graph.edge_types:
-            edges = self.__graph.get_edge_data(types=[edge_type])
-            dsts = edges[self.__graph.dst_col_name].unique()
-            srcs = edges[self.__graph.src_col_name].unique()
-
-            if self._is_delayed:
-                dsts = dsts.compute()
-                srcs = srcs.compute()
-
-            dst_types = self.__graph.get_vertex_data(
-                vertex_ids=dsts.values_host, columns=[self.__graph.type_col_name]
-            )[self.__graph.type_col_name].unique()
+        # Infer the src/dst vertex types of every edge type in a single
+        # pass over the edge data.  Since vertex ids are contiguous by
+        # type, the vertex types can be found from the type offsets
+        # on device without looking up the vertex data.
+        edges = self.__graph.get_edge_data(columns=[])
+        vtype_stop = np.asarray(self.__vertex_type_stop.tolist())
 
-            src_types = self.__graph.get_vertex_data(
-                vertex_ids=srcs.values_host, columns=[self.__graph.type_col_name]
-            )[self.__graph.type_col_name].unique()
+        src_types = self.__get_vertex_types_by_edge_type(
+            edges, vtype_stop, self.__graph.src_col_name
+        )
+        dst_types = self.__get_vertex_types_by_edge_type(
+            edges, vtype_stop, self.__graph.dst_col_name
+        )
 
-            if self._is_delayed:
-                dst_types = dst_types.compute()
-                src_types = src_types.compute()
+        self.__edge_types_to_attrs = {}
+        for edge_type in self.__edge_types:
+            if len(dst_types[edge_type]) > 1 or len(src_types[edge_type]) > 1:
+                raise TypeError(
+                    f"Edge type {edge_type} associated "
+                    "with multiple src/dst type pairs"
+                )
 
-            err_string = (
-                f"Edge type {edge_type} associated" "with multiple src/dst type pairs"
+            pyg_edge_type = (
+                src_types[edge_type][0],
+                edge_type,
+                dst_types[edge_type][0],
             )
-            if len(dst_types) > 1 or len(src_types) > 1:
-                raise TypeError(err_string)
-
-            pyg_edge_type = (src_types[0], edge_type, dst_types[0])
+            num_edges = self.__graph.get_num_edges(edge_type)
 
             self.__edge_types_to_attrs[edge_type] = CuGraphEdgeAttr(
                 edge_type=pyg_edge_type,
                 layout=EdgeLayout.COO,
                 is_sorted=False,
-                size=(len(edges), len(edges)),
+                size=(num_edges, num_edges),
+            )
+
+        # Keep the edge attr of homogeneous graphs around so the hot paths
+        # don't have to look it up every time.
+        self.__single_edge_attr = (
+            next(iter(self.__edge_types_to_attrs.values()))
+            if len(self.__edge_types_to_attrs) == 1
+            else None
+        )
+
+        # Heterogeneous samples identify edge types by their numeral
+        if len(self.__edge_types_to_attrs) > 1:
+            type_names = self.__graph.edge_types_from_numerals(
+                cudf.Series(range(len(self.__edge_types_to_attrs)), dtype="int32")
+            )
+            self.__edge_attrs_by_numeral = [
+                self.__edge_types_to_attrs[type_name]
+                for type_name in type_names.to_arrow().to_pylist()
+            ]
+
+        self._edge_attr_cls = CuGraphEdgeAttr
+
+    def __get_vertex_types_by_edge_type(self, edges, vtype_stop, col_name) -> dict:
+        """
+        Given the edge data of this store's property graph and the
+        (inclusive) last vertex id of each vertex type, returns a
+        dictionary mapping each edge type to the list of distinct
+        vertex types found in the given (src or dst) vertex column.
+        """
+        TCN = self.__graph.type_col_name
+        VTCN = f"{TCN}_vertex"
+
+        if self._is_delayed:
+            numerals = edges[col_name].map_partitions(
+                _vertex_type_numerals, vtype_stop, meta=(col_name, "int32")
             )
+        else:
+            numerals = _vertex_type_numerals(edges[col_name], vtype_stop)
+
+        pairs = edges[[TCN]].assign(**{VTCN: numerals}).drop_duplicates()
 
-            self._edge_attr_cls = CuGraphEdgeAttr
+        pairs = self.__materialize(pairs)
+
+        type_names = self.__vertex_types_by_numeral
+
+        vertex_types = defaultdict(list)
+        for edge_type, numeral in zip(
+            pairs[TCN].astype(str).values_host, pairs[VTCN].values_host
+        ):
+            vertex_types[edge_type].append(type_names[numeral])
+
+        return vertex_types
 
     def __renumber_graph(self, renumber_graph: bool) -> None:
         """
@@ -344,41 +500,85 @@ class EXPERIMENTAL__CuGraphStore:
         # FIXME Remove all renumbering logic permanently
         # and require this already be done.
         if renumber_graph:
+            # Keep the rows in id order, whatever order the offsets are
+            # returned in.
             self.__vertex_type_offsets = self.__graph.renumber_vertices_by_type(
                 prev_id_column=self.__old_vertex_col_name
-            )
+            ).sort_values("start")
 
             # FIXME: https://github.com/rapidsai/cugraph/issues/3059
             # Currently renumbering edges is required if renumbering vertices or else
             # there is a dask partitioning issue.
             self.__graph.renumber_edges_by_type(prev_id_column=self.__old_edge_col_name)
 
+            type_names = self.__vertex_type_offsets.index.to_pandas()
+            starts = self.__vertex_type_offsets["start"].values_host
+            stops = self.__vertex_type_offsets["stop"].values_host
+
         else:
-            self.__vertex_type_offsets = {}
-            self.__vertex_type_offsets["stop"] = [
-                self.__graph.get_num_vertices(vt) for vt in self.__graph.vertex_types
-            ]
-            if self.__backend == "cupy":
-                self.__vertex_type_offsets["stop"] = cupy.array(
-                    self.__vertex_type_offsets["stop"]
-                )
-            else:
-                self.__vertex_type_offsets["stop"] = torch.tensor(
-                    self.__vertex_type_offsets["stop"]
+            # The ids are already contiguous by type, but in no particular
+            # type order (single-GPU renumbering orders the types by
+            # insertion, MG renumbering by name), so read the range of each
+            # type from the vertex data.
+            TCN = self.__graph.type_col_name
+            VCN = self.__graph.vertex_col_name
+            vertices = self.__graph.get_vertex_data(columns=[])
+            vertices = vertices.assign(**{TCN: vertices[TCN].astype(str)})
+            bounds = self.__materialize(
+                vertices.groupby(TCN)[VCN].agg(["min", "max", "count"])
+            ).sort_values("min")
+
+            type_names = bounds.index.to_pandas()
+            starts = bounds["min"].values_host.astype("int64")
+            stops = bounds["max"].values_host.astype("int64")
+            if ((stops - starts + 1) != bounds["count"].values_host).any():
+                raise ValueError(
+                    "renumber_graph=False requires the vertex ids of each "
+                    "type to be contiguous"
                 )
-                if torch.has_cuda:
-                    self.__vertex_type_offsets["stop"] = self.__vertex_type_offsets[
-                        "stop"
-                    ].cuda()
-
-            cumsum = self.__vertex_type_offsets["stop"].cumsum(0)
-            self.__vertex_type_offsets["start"] = (
-                cumsum - self.__vertex_type_offsets["stop"]
-            )
-            self.__vertex_type_offsets["stop"] = cumsum - 1
-            self.__vertex_type_offsets["type"] = np.array(
-                sorted(self.__graph.vertex_types), dtype="str"
-            )
+
+            # The offsets are tiny, so compute them on the host and move
+            # each to the device once.
+            self.__vertex_type_offsets = {}
+            for key, offsets in (("start", starts), ("stop", stops)):
+                if self.__backend == "cupy":
+                    offsets = cupy.asarray(offsets)
+                else:
+                    offsets = torch.from_numpy(offsets)
+                    if torch.has_cuda:
+                        offsets = offsets.cuda()
+                self.__vertex_type_offsets[key] = offsets
+
+        # Row i of the offsets is the i-th vertex type in id order, which
+        # need not match the graph's categorical (insertion) order.
+        self.__vertex_types_by_numeral = [str(t) for t in type_names]
+        self.__vertex_type_numerals = {
+            type_name: i for i, type_name in enumerate(self.__vertex_types_by_numeral)
+        }
+        self.__vertex_type_start_host = np.asarray(starts, dtype="int64")
+        self.__vertex_type_stop_host = np.asarray(stops, dtype="int64")
+
+        # The offsets are fixed from here on, so keep the (inclusive) last
+        # vertex id of each type as a tensor for the sampling hot paths.
+        if isinstance(self.__vertex_type_offsets, dict):
+            vtype_stop = self.__vertex_type_offsets["stop"]
+        else:
+            vtype_stop = self.from_cuda_array(self.__vertex_type_offsets["stop"])
+
+        if self.__backend == "torch":
+            self.__vertex_type_stop = vtype_stop.to(self.vertex_dtype)
+        else:
+            self.__vertex_type_stop = vtype_stop.astype(self.vertex_dtype)
+
+        # Vertex ids are contiguous, so whenever they fit in 32 bits the
+        # sorts and searches over them can use 32-bit keys, which halves
+        # the memory traffic of those kernels.  Returned ids are always
+        # of vertex_dtype, since PyG expects long indices.
+        self.__num_vertices = self.__graph.get_num_vertices()
+        if self.__num_vertices < 2**31:
+            self.__id_dtype = self.compact_vertex_dtype
+        else:
+            self.__id_dtype = self.vertex_dtype
 
     @property
     def _old_vertex_col_name(self) -> str:
@@ -412,28 +612,45 @@ class EXPERIMENTAL__CuGraphStore:
         if isinstance(vtypes, str):
             vtypes = [vtypes]
 
-        # FIXME always use torch, drop cupy (#2995)
-        if self.__backend == "torch":
-            ix = torch.tensor([], dtype=torch.int64)
-        else:
-            ix = cupy.array([], dtype="int64")
+        # Gather all the offsets at once rather than one type at a time
+        rows = [self.__vertex_type_numerals[vtype] for vtype in vtypes]
+        starts = self.__vertex_type_start_host[rows]
+        lengths = self.__vertex_type_stop_host[rows] - starts + 1
+        total = int(lengths.sum())
 
-        if isinstance(self.__vertex_type_offsets, dict):
-            vtypes = np.searchsorted(self.__vertex_type_offsets["type"], vtypes)
-        for vtype in vtypes:
-            start = int(self.__vertex_type_offsets["start"][vtype])
-            stop = int(self.__vertex_type_offsets["stop"][vtype])
-            ix = self.concatenate(
-                [ix, self.arange(start, stop + 1, 1, dtype=self.vertex_dtype)]
+        if total == 0:
+            # FIXME always use torch, drop cupy (#2995)
+            if self.__backend == "torch":
+                return torch.tensor([], dtype=torch.int64)
+            else:
+                return cupy.array([], dtype="int64")
+
+        if len(rows) == 1:
+            return self.arange(
+                int(starts[0]), int(starts[0]) + total, 1, dtype=self.vertex_dtype
             )
 
-        return ix
+        # Build every range with one arange over the output, shifted by
+        # each segment's start minus its position in the output.
+        ends = lengths.cumsum()
+        bases = starts - (ends - lengths)
+        positions = self.arange(0, total, 1, dtype=self.vertex_dtype)
+        if self.__backend == "torch":
+            bases = torch.repeat_interleave(
+                torch.from_numpy(bases), torch.from_numpy(lengths)
+            )
+        else:
+            segments = cupy.searchsorted(cupy.asarray(ends), positions, side="right")
+            bases = cupy.asarray(bases)[segments]
+
+        return positions + bases
 
     def put_edge_index(self, edge_index, edge_attr):
         """
         Adds additional edges to the graph.
         Not yet implemented.
         """
+        # FIXME clear self.__edge_index_cache once adding edges is supported
         raise NotImplementedError("Adding indices not supported.")
 
     def get_all_edge_attrs(self):
@@ -450,9 +667,9 @@ class EXPERIMENTAL__CuGraphStore:
     def _get_edge_index(self, attr: CuGraphEdgeAttr) -> Tuple[TensorType, TensorType]:
         """
         Returns the edge index in the requested format
-        (as defined by attr).  Currently, only unsorted
-        COO is supported, which is returned as a (src,dst)
-        tuple as expected by the PyG API.
+        (as defined by attr).  The index for each edge type
+        and layout is materialized on first access and cached,
+        so repeated calls return the same tensors.
 
         Parameters
         ----------
@@ -460,42 +677,38 @@ class EXPERIMENTAL__CuGraphStore:
             The CuGraphEdgeAttr specifying the
             desired edge type, layout (i.e. CSR, COO, CSC), and
             whether the returned index should be sorted (if COO).
-            Currently, only unsorted COO is supported.
+            Sorted COO is not currently supported.
 
         Returns
         -------
         (src, dst) : Tuple[tensor type]
-            Tuple of the requested edge index in COO form.
-            Currently, only COO form is supported.
+            Tuple of the requested edge index in COO form,
+            (row, colptr) in CSC form, or (rowptr, col) in CSR form.
         """
 
-        if attr.layout != EdgeLayout.COO:
-            raise TypeError("Only COO direct access is supported!")
-
         if isinstance(attr.edge_type, str):
             edge_type = attr.edge_type
         else:
             edge_type = attr.edge_type[1]
 
+        cache_key = (edge_type, attr.layout)
+        if cache_key in self.__edge_index_cache:
+            return self.__edge_index_cache[cache_key]
+
+        if edge_type not in self.__edge_types_to_attrs:
+            raise ValueError(
+                f"Requested edge type {edge_type} is not present in graph."
+            )
+
         # If there is only one edge type (homogeneous graph) then
         # bypass the edge filters for a significant speed improvement.
-        if len(self.__graph.edge_types) == 1:
-            if list(self.__graph.edge_types)[0] != edge_type:
-                raise ValueError(
-                    f"Requested edge type {edge_type}" "is not present in graph."
-                )
-
+        if self.__single_edge_attr is not None:
             df = self.__graph.get_edge_data(
                 edge_ids=None,
                 types=None,
                 columns=[self.__graph.src_col_name, self.__graph.dst_col_name],
             )
         else:
-            if isinstance(attr.edge_type, str):
-                edge_type = attr.edge_type
-            else:
-                edge_type = attr.edge_type[1]
-
             # FIXME unrestricted edge type names
             df = self.__graph.get_edge_data(
                 edge_ids=None,
@@ -503,34 +716,72 @@ class EXPERIMENTAL__CuGraphStore:
                 columns=[self.__graph.src_col_name, self.__graph.dst_col_name],
             )
 
-        if self._is_delayed:
-            df = df.compute()
+        df = self.__materialize(df)
 
-        src = self.from_dlpack(df[self.__graph.src_col_name].to_dlpack())
-        dst = self.from_dlpack(df[self.__graph.dst_col_name].to_dlpack())
+        src = self.from_cuda_array(df[self.__graph.src_col_name])
+        dst = self.from_cuda_array(df[self.__graph.dst_col_name])
 
+        # The cached COO index must not alias the graph's own columns, so
+        # copy as part of the cast.  The compressed layouts permute the ids
+        # below, which already produces new tensors.
+        copy = attr.layout == EdgeLayout.COO
         if self.__backend == "torch":
-            src = src.to(self.vertex_dtype)
-            dst = dst.to(self.vertex_dtype)
+            src = src.to(self.vertex_dtype, copy=copy)
+            dst = dst.to(self.vertex_dtype, copy=copy)
         elif self.__backend == "cupy":
-            src = src.astype(self.vertex_dtype)
-            dst = dst.astype(self.vertex_dtype)
+            src = src.astype(self.vertex_dtype, copy=copy)
+            dst = dst.astype(self.vertex_dtype, copy=copy)
         else:
             raise TypeError(f"Invalid backend type {self.__backend}")
 
-        if self.__backend == "torch":
-            src = src.to(self.vertex_dtype)
-            dst = dst.to(self.vertex_dtype)
-        else:
-            # self.__backend == 'cupy'
-            src = src.astype(self.vertex_dtype)
-            dst = dst.astype(self.vertex_dtype)
-
         if src.shape[0] != dst.shape[0]:
             raise IndexError("src and dst shape do not match!")
 
+        if attr.layout == EdgeLayout.CSC:
+            keys = self.__to_id_dtype(dst)
+            perm = self.argsort(keys)
+            src = src[perm]
+            dst = self.__compress_index(keys[perm])
+        elif attr.layout == EdgeLayout.CSR:
+            keys = self.__to_id_dtype(src)
+            perm = self.argsort(keys)
+            dst = dst[perm]
+            src = self.__compress_index(keys[perm])
+
+        self.__edge_index_cache[cache_key] = (src, dst)
         return (src, dst)
 
+    def __compress_index(self, sorted_ix: TensorType) -> TensorType:
+        """
+        Compresses a sorted vertex index into a pointer array
+        of length (number of vertices + 1), where the entries of
+        vertex v are found in [ptr[v], ptr[v+1]).
+        """
+        vertices = self.__arange_like(self.__num_vertices + 1, sorted_ix)
+        ptr = self.searchsorted(sorted_ix, vertices)
+
+        if self.__backend == "torch":
+            return ptr.to(self.vertex_dtype)
+        return ptr.astype(self.vertex_dtype, copy=False)
+
+    def __to_id_dtype(self, ix: TensorType) -> TensorType:
+        """
+        Casts vertex ids to the narrowest dtype that holds every
+        vertex id in this store's graph.
+        """
+        if self.__backend == "torch":
+            return ix.to(self.__id_dtype)
+        return ix.astype(self.__id_dtype, copy=False)
+
+    def __arange_like(self, stop: int, like: TensorType) -> TensorType:
+        """
+        Returns the range [0, stop) with the dtype (and device)
+        of the given tensor.
+        """
+        if self.__backend == "torch":
+            return self.arange(stop, dtype=like.dtype, device=like.device)
+        return self.arange(stop, dtype=like.dtype)
+
     def get_edge_index(self, *args, **kwargs) -> Tuple[TensorType, TensorType]:
         r"""Synchronously gets an edge_index tensor from the materialized
         graph.
@@ -546,13 +797,14 @@ class EXPERIMENTAL__CuGraphStore:
             KeyError: if the edge index corresponding to attr was not found.
         """
 
-        edge_attr = self._edge_attr_cls.cast(*args, **kwargs)
-        edge_attr.layout = EdgeLayout(edge_attr.layout)
+        edge_attr = _cast_attr(self._edge_attr_cls, *args, **kwargs)
+        if not isinstance(edge_attr.layout, EdgeLayout):
+            edge_attr.layout = EdgeLayout(edge_attr.layout)
         # Override is_sorted for CSC and CSR:
         # TODO treat is_sorted specially in this function, where is_sorted=True
         # returns an edge index sorted by column.
         edge_attr.is_sorted = edge_attr.is_sorted or (
-            edge_attr.layout in [EdgeLayout.CSC, EdgeLayout.CSR]
+            edge_attr.layout in (EdgeLayout.CSC, EdgeLayout.CSR)
         )
         edge_index = self._get_edge_index(edge_attr)
         if edge_index is None:
@@ -578,11 +830,9 @@ class EXPERIMENTAL__CuGraphStore:
         edge_types = tuple(sorted(edge_types))
 
         if edge_types not in self.__subgraphs:
+            # A single membership test rather than one comparison per type
             TCN = self.__graph.type_col_name
-            query = f'({TCN}=="{edge_types[0]}")'
-            for t in edge_types[1:]:
-                query += f' | ({TCN}=="{t}")'
-            selection = self.__graph.select_edges(query)
+            selection = self.__graph.select_edges(f"{TCN}.isin({list(edge_types)!r})")
 
             # FIXME enforce int type
             sg = self.__graph.extract_subgraph(
@@ -612,35 +862,32 @@ class EXPERIMENTAL__CuGraphStore:
         follow PyG's conventions, allowing easy construction of a HeteroData object.
         """
 
-        nodes_of_interest = self.from_dlpack(
-            nodes_of_interest.sort_values().to_dlpack()
-        )
+        nodes_of_interest = self.from_cuda_array(nodes_of_interest.sort_values())
 
         noi_index = {}
 
-        vtypes = list(self.__graph.vertex_types)
-        if len(vtypes) == 1:
-            noi_index[vtypes[0]] = nodes_of_interest
+        if self.__single_vertex_type is not None:
+            noi_index[self.__single_vertex_type] = nodes_of_interest
         else:
-            # FIXME remove use of cudf
-            noi_types = self.__graph.vertex_types_from_numerals(
-                cudf.from_dlpack(
-                    self.searchsorted(
-                        self.from_dlpack(
-                            self.__vertex_type_offsets["stop"].to_dlpack()
-                        ),
-                        nodes_of_interest,
-                    ).__dlpack__()
-                )
-            )
-
-            noi_types = cudf.Series(noi_types, name="t").groupby("t").groups
-
-            for type_name, ix in noi_types.items():
-                # store the renumbering for this vertex type
-                # renumbered vertex id is the index of the old id
-                ix = self.from_dlpack(ix.to_dlpack())
-                noi_index[type_name] = nodes_of_interest[ix]
+            vtype_stop = self.__vertex_type_stop
+            if vtype_stop.dtype != nodes_of_interest.dtype:
+                if self.__backend == "torch":
+                    vtype_stop = vtype_stop.to(nodes_of_interest.dtype)
+                else:
+                    vtype_stop = vtype_stop.astype(nodes_of_interest.dtype)
+
+            # Since the nodes of interest are sorted, and vertex ids are
+            # contiguous by type, each vertex type occupies a single
+            # segment of nodes_of_interest ending at its last id.
+            ends = self.searchsorted(nodes_of_interest, vtype_stop, side="right")
+            ends = ends.tolist()
+            start = 0
+            for type_name, end in zip(self.__vertex_types_by_numeral, ends):
+                if end > start:
+                    # store the renumbering for this vertex type
+                    # renumbered vertex id is the index of the old id
+                    noi_index[type_name] = nodes_of_interest[start:end]
+                start = end
 
         return noi_index
 
@@ -690,40 +937,60 @@ class EXPERIMENTAL__CuGraphStore:
         # print(sampling_results.edge_type.value_counts())
         row_dict = {}
         col_dict = {}
-        if len(self.__edge_types_to_attrs) == 1:
-            t_pyg_type = list(self.__edge_types_to_attrs.values())[0].edge_type
+        if self.__single_edge_attr is not None:
+            t_pyg_type = self.__single_edge_attr.edge_type
             src_type, edge_type, dst_type = t_pyg_type
 
-            sources = self.from_dlpack(sampling_results.sources.to_dlpack())
+            sources = self.from_cuda_array(sampling_results.sources)
             src_id_table = noi_index[src_type]
             src = self.searchsorted(src_id_table, sources)
             row_dict[t_pyg_type] = src
 
-            destinations = self.from_dlpack(sampling_results.destinations.to_dlpack())
+            destinations = self.from_cuda_array(sampling_results.destinations)
             dst_id_table = noi_index[dst_type]
             dst = self.searchsorted(dst_id_table, destinations)
             col_dict[t_pyg_type] = dst
         else:
-            eoi_types = self.__graph.edge_types_from_numerals(
-                sampling_results.indices.astype("int32")
-            )
-            eoi_types = cudf.Series(eoi_types, name="t").groupby("t").groups
-
-            for cugraph_type_name, ix in eoi_types.items():
-                t_pyg_type = self.__edge_types_to_attrs[cugraph_type_name].edge_type
-                src_type, edge_type, dst_type = t_pyg_type
-
-                sources = self.from_dlpack(sampling_results.sources.loc[ix].to_dlpack())
-                src_id_table = noi_index[src_type]
-                src = self.searchsorted(src_id_table, sources)
-                row_dict[t_pyg_type] = src
-
-                destinations = self.from_dlpack(
-                    sampling_results.destinations.loc[ix].to_dlpack()
-                )
-                dst_id_table = noi_index[dst_type]
-                dst = self.searchsorted(dst_id_table, destinations)
-                col_dict[t_pyg_type] = dst
+            # Concatenate the vertex ids of each type in type order so that
+            # all the sampled vertices can be renumbered with a single
+            # searchsorted.  Since vertex ids are contiguous by type, the
+            # concatenated ids are still sorted.
+            noi_types = sorted(noi_index, key=self.__vertex_type_numerals.get)
+            noi_offsets = {}
+            offset = 0
+            for vertex_type in noi_types:
+                noi_offsets[vertex_type] = offset
+                offset += len(noi_index[vertex_type])
+            noi_ids = self.concatenate([noi_index[t] for t in noi_types])
+
+            sources = self.from_cuda_array(sampling_results.sources)
+            src = self.searchsorted(noi_ids, sources)
+
+            destinations = self.from_cuda_array(sampling_results.destinations)
+            dst = self.searchsorted(noi_ids, destinations)
+
+            # Sort the sampled edges by type numeral so that the edges
+            # of each type form a contiguous segment of the permutation.
+            eoi_types = self.from_cuda_array(sampling_results.indices.astype("int32"))
+            perm = self.argsort(eoi_types)
+            ends = self.searchsorted(
+                eoi_types[perm],
+                self.__arange_like(len(self.__edge_attrs_by_numeral), eoi_types),
+                side="right",
+            ).tolist()
+
+            start = 0
+            for edge_attr, end in zip(self.__edge_attrs_by_numeral, ends):
+                if end > start:
+                    t_pyg_type = edge_attr.edge_type
+                    src_type, edge_type, dst_type = t_pyg_type
+
+                    # renumbered vertex id is the index of the old id
+                    # within the ids of its type
+                    ix = perm[start:end]
+                    row_dict[t_pyg_type] = src[ix] - noi_offsets[src_type]
+                    col_dict[t_pyg_type] = dst[ix] - noi_offsets[dst_type]
+                start = end
 
         return row_dict, col_dict
 
@@ -755,6 +1022,8 @@ class EXPERIMENTAL__CuGraphStore:
                 vertex_type, attr_name, properties=properties, dtype=dtype
             )
         )
+        self._infer_cache.clear()
+        self._n_tensor_attrs += 1
 
     def __infer_x_and_y_tensors(self) -> None:
         """
@@ -765,14 +1034,18 @@ class EXPERIMENTAL__CuGraphStore:
         See issue #2942 for more details.
         """
         prop_names = self.__graph.vertex_property_names
+        # Every vertex type shares the graph's vertex property columns.
+        self._group_all_cols = frozenset(prop_names)
         add_y_property = False
         if "y" in prop_names:
             prop_names.remove("y")
             add_y_property = True
 
-        for vtype in self.__graph.vertex_types:
+        # Every vertex type shares the same property lists.
+        y_prop_names = ["y"]
+        for vtype in self.__vertex_types:
             if add_y_property:
-                self.create_named_tensor("y", ["y"], vtype, self.vertex_dtype)
+                self.create_named_tensor("y", y_prop_names, vtype, self.vertex_dtype)
 
             # FIXME use the new vector property feature in PropertyGraph
             # (graph_dl issue #96)
@@ -787,48 +1060,253 @@ class EXPERIMENTAL__CuGraphStore:
     def __get_tensor_from_dataframe(self, df, attr):
         df = df[attr.properties]
 
-        if self._is_delayed:
-            df = df.compute()
+        df = self.__materialize(df)
 
         # FIXME handle vertices without properties
-        output = self.from_dlpack(df.to_dlpack())
-
         # FIXME look up the dtypes for x and other properties
-        if output.dtype != attr.dtype:
-            if self.__backend == "torch":
+        if self.__backend == "torch":
+            output = self.from_dlpack(df.to_dlpack())
+            if output.dtype != attr.dtype:
                 output = output.to(self.property_dtype)
-            elif self.__backend == "cupy":
-                output = output.astype(self.property_dtype)
+            return output
+        elif self.__backend == "cupy":
+            # When a cast is needed, do it while copying the columns
+            # into the output rather than as a second copy afterwards.
+            dtypes = df.dtypes if isinstance(df, cudf.DataFrame) else [df.dtype]
+            if np.result_type(*dtypes) == attr.dtype:
+                return df.to_cupy()
+            return df.to_cupy(dtype=self.property_dtype)
+        else:
+            raise ValueError(f"invalid backend {self.__backend}")
+
+    def __get_vertex_data(self, group_name, idx, cols):
+        if self._is_delayed:
+            # The distributed lookup needs host ids, so copy them there
+            # directly rather than round-tripping through the device.
+            if self.__backend == "torch":
+                idx = idx.detach().cpu().numpy()
             else:
-                raise ValueError(f"invalid backend {self.__backend}")
+                idx = cupy.asnumpy(idx)
+        elif self.__backend == "torch":
+            # cudf can look up device ids directly.  Host tensors are
+            # staged through pinned memory, which makes the copy to the
+            # device asynchronous instead of a pageable transfer.
+            idx = idx.detach()
+            if not idx.is_cuda:
+                idx = idx.pin_memory().cuda(non_blocking=True)
+            # The ids were written on torch's current stream but cudf
+            # reads them on the default stream, so wait for them unless
+            # the two are the same.
+            stream = torch.cuda.current_stream(idx.device)
+            if stream != torch.cuda.default_stream(idx.device):
+                stream.synchronize()
+            idx = cupy.asarray(idx)
+
+        if self.__single_vertex_type is not None:
+            # make sure we don't waste computation if there's only 1 type
+            return self.__graph.get_vertex_data(
+                vertex_ids=idx, types=None, columns=cols
+            )
 
-        return output
+        return self.__graph.get_vertex_data(
+            vertex_ids=idx, types=[group_name], columns=cols
+        )
 
     def _get_tensor(self, attr: CuGraphTensorAttr) -> TensorType:
-        if attr.attr_name == "x":
+        return self._gather(attr.group_name, attr.index, [attr])[0]
+
+    def __gather_from_graph(self, group_name, index, attrs):
+        # Serves attrs of one group that share an index with a single
+        # lookup of the union of their properties.
+        if any(attr.attr_name == "x" for attr in attrs):
             cols = None
+        elif len(attrs) == 1:
+            # the common single-tensor lookup needs no union
+            cols = attrs[0].properties
         else:
-            cols = attr.properties
-
-        idx = attr.index
-        if self.__backend == "torch" and not idx.is_cuda:
-            idx = idx.cuda()
-        idx = cupy.from_dlpack(idx.__dlpack__())
+            cols = {}
+            for attr in attrs:
+                props = attr.properties
+                cols.update(dict.fromkeys([props] if isinstance(props, str) else props))
+            cols = list(cols)
+
+        if cols is not None and not isinstance(cols, str):
+            # skip the projection when every property is requested
+            all_cols = self._group_all_cols
+            if len(cols) >= len(all_cols) and all_cols.issubset(cols):
+                cols = None
+
+        df = self.__get_vertex_data(group_name, index, cols)
+        return [self.__get_tensor_from_dataframe(df, attr) for attr in attrs]
+
+    def __nbytes(self, tensor):
+        if self.__backend == "torch":
+            return tensor.element_size() * tensor.nelement()
+        return tensor.nbytes
+
+    def __feature_cache_key(self, attr):
+        props = attr.properties
+        if not isinstance(props, str):
+            props = tuple(props)
+        return (attr.group_name, attr.attr_name, props, attr.dtype)
+
+    def __feature_cache_bucket(self, index):
+        # The sum is the only value read back from the device, once per
+        # lookup; the same bucket is reused when the entry is stored.
+        device = index.device if self.__backend == "torch" else index.device.id
+        return (device, len(index), int(index.sum()))
+
+    def __feature_cache_lookup(self, index, bucket):
+        """
+        Returns the token and tensors of the cached entry whose index is
+        equal to the given one, or (None, {}) if there is none.
+        """
+        with self.__feature_cache_lock:
+            candidates = [
+                (token, self.__feature_cache[token])
+                for token in self.__feature_cache_buckets.get(bucket, ())
+            ]
+        if len(candidates) == 0:
+            return None, {}
+
+        # Compare against every candidate in the bucket on the device, and
+        # bring the results back in one transfer.
+        stack = torch.stack if self.__backend == "torch" else cupy.stack
+        matches = stack([(entry[0] == index).all() for _, entry in candidates])
+        for (token, entry), match in zip(candidates, matches.tolist()):
+            if match:
+                with self.__feature_cache_lock:
+                    if token in self.__feature_cache:
+                        self.__feature_cache.move_to_end(token)
+                    return token, dict(entry[1])
+
+        return None, {}
+
+    def __feature_cache_put(self, token, index, bucket, tensors):
+        with self.__feature_cache_lock:
+            entry = self.__feature_cache.get(token)
+            if entry is None:
+                # an entry's index is counted once, however many tensors
+                # share it
+                nbytes = self.__nbytes(index)
+            else:
+                # another thread may have cached some of these meanwhile
+                tensors = {k: t for k, t in tensors.items() if k not in entry[1]}
+                nbytes = entry[2]
+            nbytes += sum(self.__nbytes(tensor) for tensor in tensors.values())
+            if nbytes > self.__feature_cache_bytes:
+                return
+
+            if entry is None:
+                # the index may be reused by the caller, so keep a copy
+                if self.__backend == "torch":
+                    index = index.clone()
+                else:
+                    index = index.copy()
+                entry = [index, {}, 0, bucket]
+                token = next(self.__feature_cache_tokens)
+                self.__feature_cache[token] = entry
+                self.__feature_cache_buckets.setdefault(bucket, []).append(token)
+            else:
+                self.__feature_cache.move_to_end(token)
+
+            entry[1].update(tensors)
+            self.__feature_cache_used += nbytes - entry[2]
+            entry[2] = nbytes
+
+            while self.__feature_cache_used > self.__feature_cache_bytes:
+                evicted, entry = self.__feature_cache.popitem(last=False)
+                self.__feature_cache_used -= entry[2]
+                tokens = self.__feature_cache_buckets[entry[3]]
+                tokens.remove(evicted)
+                if len(tokens) == 0:
+                    del self.__feature_cache_buckets[entry[3]]
+
+    def _gather(
+        self, group_name: str, index: TensorType, attrs: List[CuGraphTensorAttr]
+    ) -> List[TensorType]:
+        if self.__feature_cache_bytes <= 0:
+            return self.__gather_from_graph(group_name, index, attrs)
 
-        if len(self.__graph.vertex_types) == 1:
-            # make sure we don't waste computation if there's only 1 type
-            df = self.__graph.get_vertex_data(
-                vertex_ids=idx.get(), types=None, columns=cols
-            )
+        if self.__backend == "torch":
+            index = torch.as_tensor(index)
         else:
-            df = self.__graph.get_vertex_data(
-                vertex_ids=idx.get(), types=[attr.group_name], columns=cols
-            )
+            index = cupy.asarray(index)
+
+        keys = [self.__feature_cache_key(attr) for attr in attrs]
+        bucket = self.__feature_cache_bucket(index)
+        token, cached = self.__feature_cache_lookup(index, bucket)
+        tensors = [cached.get(key) for key in keys]
 
-        return self.__get_tensor_from_dataframe(df, attr)
+        missed = [i for i, t in enumerate(tensors) if t is None]
+        if len(missed) == 0:
+            return tensors
+
+        fetched = self.__gather_from_graph(
+            group_name, index, [attrs[i] for i in missed]
+        )
+        for i, tensor in zip(missed, fetched):
+            tensors[i] = tensor
+        self.__feature_cache_put(
+            token, index, bucket, {keys[i]: tensors[i] for i in missed}
+        )
+
+        return tensors
+
+    def gather(
+        self,
+        group_name: str,
+        index: TensorType,
+        columns_by_attr: dict,
+        dtype: Optional[Any] = None,
+    ) -> dict:
+        """
+        Gathers several named tensors of one vertex type for the same
+        index with a single lookup of the underlying graph.
+
+        Parameters
+        ----------
+        group_name : str
+            The vertex type to gather from.
+        index : Tensor
+            The vertex ids the rows of each tensor correspond to.
+        columns_by_attr : dict[str, list[str]]
+            The properties making up each requested tensor, keyed by
+            the name of the tensor.
+        dtype : numpy/cupy dtype (i.e. 'int32') or torch dtype (i.e. torch.float)
+            The datatype of the tensors.  Defaults to this store's
+            property dtype.
+
+        Returns
+        -------
+        dict[str, Tensor]
+            The tensor for each attr name in columns_by_attr.
+        """
+        if dtype is None:
+            dtype = self.property_dtype
+
+        attrs = [
+            self._tensor_attr_cls(group_name, attr_name, index, properties, dtype)
+            for attr_name, properties in columns_by_attr.items()
+        ]
+        tensors = self._gather(group_name, index, attrs)
+        return dict(zip(columns_by_attr, tensors))
 
     def _multi_get_tensor(self, attrs: List[CuGraphTensorAttr]) -> List[TensorType]:
-        return [self._get_tensor(attr) for attr in attrs]
+        groups = defaultdict(list)
+        for i, attr in enumerate(attrs):
+            groups[attr.group_name, id(attr.index)].append(i)
+
+        tensors = [None] * len(attrs)
+        for positions in groups.values():
+            first = attrs[positions[0]]
+            group_tensors = self._gather(
+                first.group_name, first.index, [attrs[i] for i in positions]
+            )
+            for i, tensor in zip(positions, group_tensors):
+                tensors[i] = tensor
+
+        return tensors
 
     def multi_get_tensor(self, attrs: List[CuGraphTensorAttr]) -> List[TensorType]:
         r"""
@@ -851,11 +1329,16 @@ class EXPERIMENTAL__CuGraphStore:
             KeyError: if a tensor corresponding to an attr was not found.
             ValueError: if any input `TensorAttr` is not fully specified.
         """
-        attrs = [
-            self._infer_unspecified_attr(self._tensor_attr_cls.cast(attr))
-            for attr in attrs
-        ]
-        bad_attrs = [attr for attr in attrs if not attr.is_fully_specified()]
+        attrs = list(attrs)
+        bad_attrs = []
+        for i, attr in enumerate(attrs):
+            attr = _cast_attr(self._tensor_attr_cls, attr)
+            if not attr.is_fully_specified():
+                attr = self._infer_unspecified_attr(attr)
+                if not attr.is_fully_specified():
+                    bad_attrs.append(attr)
+            attrs[i] = attr
+
         if len(bad_attrs) > 0:
             raise ValueError(
                 f"The input TensorAttr(s) '{bad_attrs}' are not fully "
@@ -865,13 +1348,74 @@ class EXPERIMENTAL__CuGraphStore:
 
         tensors = self._multi_get_tensor(attrs)
 
-        bad_attrs = [attrs[i] for i, v in enumerate(tensors) if v is None]
-        if len(bad_attrs) > 0:
+        if any(t is None for t in tensors):
+            bad_attrs = [attr for attr, t in zip(attrs, tensors) if t is None]
             raise KeyError(
                 f"Tensors corresponding to attributes " f"'{bad_attrs}' were not found"
             )
 
-        return [tensor for attr, tensor in zip(attrs, tensors)]
+        return tensors
+
+    def iter_multi_get_tensor(
+        self, attrs_iter: Iterable[List[CuGraphTensorAttr]], prefetch: int = 2
+    ) -> Iterator[List[TensorType]]:
+        r"""
+        Lazily obtains the tensors for each list of attributes in
+        `attrs_iter`, as multi_get_tensor would.  Up to `prefetch` lists
+        are fetched ahead on a background thread, so that fetching the
+        next batch of features overlaps with the caller's work on the
+        current one.
+
+        Parameters
+        ----------
+        attrs_iter (Iterable[List[TensorAttr]]): lists of :class:`TensorAttr`
+        attributes, each identifying the tensors to get for one batch.
+        prefetch (int): the maximum number of batches fetched ahead.
+
+        Returns
+        -------
+        Iterator[List[FeatureTensorType]]: the tensors for each list of
+        attributes, in order.
+
+        Raises
+        ------
+            KeyError: if a tensor corresponding to an attr was not found.
+            ValueError: if any input `TensorAttr` is not fully specified,
+                or if prefetch is less than 1.
+        """
+        if prefetch < 1:
+            raise ValueError(f"prefetch must be at least 1, got {prefetch}")
+
+        # The current device is per thread, so the worker has to be
+        # put on the caller's device explicitly.
+        if self.__backend == "torch":
+            device = torch.cuda.current_device() if torch.cuda.is_available() else None
+            device_context = torch.cuda.device
+        else:
+            device = cupy.cuda.Device().id
+            device_context = cupy.cuda.Device
+
+        def fetch(attrs):
+            with device_context(device):
+                return self.multi_get_tensor(attrs)
+
+        return self.__prefetch(fetch, attrs_iter, prefetch)
+
+    def __prefetch(self, fetch, attrs_iter, prefetch):
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            try:
+                for attrs in attrs_iter:
+                    pending.append(executor.submit(fetch, attrs))
+                    if len(pending) > prefetch:
+                        yield pending.popleft().result()
+
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                # don't fetch batches that will never be consumed
+                for future in pending:
+                    future.cancel()
 
     def get_tensor(self, *args, **kwargs) -> TensorType:
         r"""Synchronously obtains a :class:`FeatureTensorType` object from the
@@ -897,15 +1441,16 @@ class EXPERIMENTAL__CuGraphStore:
         ValueError: if the input `TensorAttr` is not fully specified.
         """
 
-        attr = self._tensor_attr_cls.cast(*args, **kwargs)
-        attr = self._infer_unspecified_attr(attr)
+        attr = _cast_attr(self._tensor_attr_cls, *args, **kwargs)
 
         if not attr.is_fully_specified():
-            raise ValueError(
-                f"The input TensorAttr '{attr}' is not fully "
-                f"specified. Please fully specify the input by "
-                f"specifying all 'UNSET' fields."
-            )
+            attr = self._infer_unspecified_attr(attr)
+            if not attr.is_fully_specified():
+                raise ValueError(
+                    f"The input TensorAttr '{attr}' is not fully "
+                    f"specified. Please fully specify the input by "
+                    f"specifying all 'UNSET' fields."
+                )
 
         tensor = self._get_tensor(attr)
         if tensor is None:
@@ -920,7 +1465,7 @@ class EXPERIMENTAL__CuGraphStore:
         Obtains the size of a tensor given its attributes, or :obj:`None`
         if the tensor does not exist.
         """
-        attr = self._tensor_attr_cls.cast(*args, **kwargs)
+        attr = _cast_attr(self._tensor_attr_cls, *args, **kwargs)
         if not attr.is_set("index"):
             attr.index = None
         return self._get_tensor_size(attr)
@@ -929,23 +1474,38 @@ class EXPERIMENTAL__CuGraphStore:
         raise NotImplementedError("Removing features not supported")
 
     def _infer_unspecified_attr(self, attr: CuGraphTensorAttr) -> CuGraphTensorAttr:
-        if attr.properties == _field_status.UNSET:
-            # attempt to infer property names
-            if attr.group_name in self._tensor_attr_dict:
-                for n in self._tensor_attr_dict[attr.group_name]:
-                    if attr.attr_name == n.attr_name:
-                        attr.properties = n.properties
-            else:
-                raise KeyError(f"Invalid group name {attr.group_name}")
-
-        if attr.dtype == _field_status.UNSET:
-            # attempt to infer dtype
-            if attr.group_name in self._tensor_attr_dict:
-                for n in self._tensor_attr_dict[attr.group_name]:
-                    if attr.attr_name == n.attr_name:
-                        attr.dtype = n.dtype
+        need_properties = attr.properties == _field_status.UNSET
+        need_dtype = attr.dtype == _field_status.UNSET
+        if not (need_properties or need_dtype):
+            return attr
+
+        key = (attr.group_name, attr.attr_name)
+        if key in self._infer_cache:
+            inferred = self._infer_cache[key]
+        else:
+            # .get so that the defaultdict is not grown by the lookup
+            entries = self._tensor_attr_dict.get(attr.group_name)
+            if entries is None:
+                if need_properties:
+                    raise KeyError(f"Invalid group name {attr.group_name}")
+                return attr
+
+            # attempt to infer property names and dtype; the most
+            # recently created tensor of this name takes precedence
+            inferred = None
+            for n in reversed(entries):
+                if attr.attr_name == n.attr_name:
+                    inferred = (n.properties, n.dtype)
+                    break
+            self._infer_cache[key] = inferred
+
+        if inferred is not None:
+            if need_properties:
+                attr.properties = inferred[0]
+            if need_dtype:
+                attr.dtype = inferred[1]
 
         return attr
 
     def __len__(self):
-        return len(self.get_all_tensor_attrs())
+        return self._n_tensor_attrs
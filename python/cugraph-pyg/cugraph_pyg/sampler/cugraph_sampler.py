@@ -147,7 +147,8 @@ class EXPERIMENTAL__CuGraphSampler:
         # FIXME resolve the directed/undirected issue
         G = self.__graph_store._subgraph([et[1] for et in edge_types])
 
-        index = cudf.from_dlpack(index.__dlpack__())
+        # wrap the device index through the CUDA array interface
+        index = cudf.Series(index)
 
         sample_fn = (
             cugraph.dask.uniform_neighbor_sample
@@ -233,6 +233,48 @@ def test_get_edge_index(graph):
         assert merged_df.counter.sum() == len(src)
 
 
+def test_get_edge_index_does_not_alias_graph(graph):
+    pG = graph
+    feature_store, graph_store = to_pyg(pG, backend="cupy")
+
+    edge_type = sorted(pG.edge_types)[0]
+    expected = pG.get_edge_data(types=[edge_type], columns=[pG.src_col_name])[
+        pG.src_col_name
+    ].values_host.tolist()
+
+    src, dst = graph_store.get_edge_index(
+        edge_type=edge_type, layout="coo", is_sorted=False
+    )
+    src[:] = -1
+
+    actual = pG.get_edge_data(types=[edge_type], columns=[pG.src_col_name])[
+        pG.src_col_name
+    ]
+    assert actual.values_host.tolist() == expected
+
+
+@pytest.mark.parametrize("layout", ["csc", "csr"])
+def test_get_edge_index_compressed(graph, layout):
+    pG = graph
+    feature_store, graph_store = to_pyg(pG, backend="cupy")
+
+    for edge_type in pG.edge_types:
+        src, dst = graph_store.get_edge_index(edge_type=edge_type, layout="coo")
+        row, col = graph_store.get_edge_index(edge_type=edge_type, layout=layout)
+
+        # the edge index should be cached after the first call
+        assert graph_store.get_edge_index(edge_type=edge_type, layout=layout)[0] is row
+
+        if layout == "csc":
+            col = cupy.repeat(cupy.arange(len(col) - 1), cupy.diff(col).tolist())
+        else:
+            row = cupy.repeat(cupy.arange(len(row) - 1), cupy.diff(row).tolist())
+
+        expected = cudf.DataFrame({"src": src, "dst": dst}).sort_values(["src", "dst"])
+        actual = cudf.DataFrame({"src": row, "dst": col}).sort_values(["src", "dst"])
+        assert expected.values.tolist() == actual.values.tolist()
+
+
 def test_edge_types(graph):
     pG = graph
     feature_store, graph_store = to_pyg(pG, backend="cupy")
@@ -418,6 +460,116 @@ def test_multi_get_tensor_unspec_props(multi_edge_multi_vertex_property_graph_1)
     assert tensors[1].tolist() == [[100.0, 5.0], [200.0, 4.0], [300.0, 3.0]]
 
 
+def test_multi_get_tensor_shared_index(graph):
+    pG = graph
+    feature_store, graph_store = to_pyg(pG, backend="cupy")
+
+    idx = cupy.array([0, 1, 2, 3, 4])
+    for vertex_type in pG.vertex_types:
+        tensors = feature_store.multi_get_tensor(
+            [
+                CuGraphTensorAttr(vertex_type, "a", idx, ["prop1"], cupy.float32),
+                CuGraphTensorAttr(vertex_type, "b", idx, ["prop2"], cupy.float32),
+            ]
+        )
+
+        data = pG.get_vertex_data(
+            vertex_ids=cudf.Series(idx), types=vertex_type, columns=["prop1", "prop2"]
+        )
+        for tsr, prop in zip(tensors, ["prop1", "prop2"]):
+            expected = data[[prop]].to_cupy(dtype=cupy.float32)
+            assert tsr.tolist() == expected.tolist()
+
+
+def test_gather(graph):
+    pG = graph
+    feature_store, graph_store = to_pyg(pG, backend="cupy")
+
+    idx = cupy.array([0, 1, 2, 3, 4])
+    for vertex_type in pG.vertex_types:
+        tensors = feature_store.gather(
+            vertex_type, idx, {"a": ["prop1"], "b": ["prop2", "prop1"]}
+        )
+        assert list(tensors) == ["a", "b"]
+
+        data = pG.get_vertex_data(
+            vertex_ids=cudf.Series(idx), types=vertex_type, columns=["prop1", "prop2"]
+        )
+        for attr_name, props in [("a", ["prop1"]), ("b", ["prop2", "prop1"])]:
+            expected = data[props].to_cupy(dtype=cupy.float32)
+            assert tensors[attr_name].tolist() == expected.tolist()
+
+
+@pytest.mark.parametrize("prefetch", [1, 2, 5])
+def test_iter_multi_get_tensor(graph, prefetch):
+    pG = graph
+    feature_store, graph_store = to_pyg(pG, backend="cupy")
+
+    batches = [
+        [CuGraphTensorAttr(vertex_type, "x", cupy.array(ids))]
+        for vertex_type in sorted(pG.vertex_types)
+        for ids in ([0, 1, 2], [3, 4])
+    ]
+
+    results = list(feature_store.iter_multi_get_tensor(batches, prefetch=prefetch))
+    assert len(results) == len(batches)
+    for batch, tensors in zip(batches, results):
+        expected = feature_store.multi_get_tensor(batch)
+        assert [t.tolist() for t in tensors] == [t.tolist() for t in expected]
+
+
+def test_get_tensor_feature_cache(graph):
+    pG = graph
+    feature_store, graph_store = to_pyg(pG, backend="cupy", feature_cache_bytes=1 << 20)
+
+    for vertex_type in pG.vertex_types:
+        t1 = feature_store.get_tensor(vertex_type, "x", cupy.array([0, 1, 2, 3]))
+        t2 = feature_store.get_tensor(vertex_type, "x", cupy.array([0, 1, 2, 3]))
+        assert t2 is t1
+
+        # same length and checksum, different ids
+        t3 = feature_store.get_tensor(vertex_type, "x", cupy.array([1, 0, 3, 2]))
+        assert t3 is not t1
+
+        data = pG.get_vertex_data(
+            vertex_ids=cudf.Series([1, 0, 3, 2]),
+            types=vertex_type,
+            columns=["prop1", "prop2"],
+        )[["prop1", "prop2"]].to_cupy(dtype=cupy.float32)
+        assert t3.tolist() == data.tolist()
+
+        # both entries now share a bucket, and each is still found
+        t4 = feature_store.get_tensor(vertex_type, "x", cupy.array([1, 0, 3, 2]))
+        assert t4 is t3
+        t5 = feature_store.get_tensor(vertex_type, "x", cupy.array([0, 1, 2, 3]))
+        assert t5 is t1
+
+
+@pytest.mark.parametrize("device", [0, 1])
+def test_iter_multi_get_tensor_device(device):
+    if device >= cupy.cuda.runtime.getDeviceCount():
+        pytest.skip("not enough GPUs")
+
+    with cupy.cuda.Device(device):
+        pG = PropertyGraph()
+        pG.add_vertex_data(
+            cudf.DataFrame({"id": [0, 1, 2], "prop1": [1.0, 2.0, 3.0]}),
+            vertex_col_name="id",
+            type_name="vt",
+        )
+        pG.add_edge_data(
+            cudf.DataFrame({"src": [0, 1], "dst": [1, 2]}),
+            vertex_col_names=["src", "dst"],
+            type_name="et",
+        )
+        feature_store, graph_store = to_pyg(pG, backend="cupy")
+
+        batches = [[CuGraphTensorAttr("vt", "x", cupy.array([0, 2]))]]
+        for tensors in feature_store.iter_multi_get_tensor(batches):
+            assert tensors[0].device.id == device
+            assert tensors[0].tolist() == [[1.0], [3.0]]
+
+
 def test_get_tensor_from_tensor_attrs(graph):
     pG = graph
     feature_store, graph_store = to_pyg(pG, backend="cupy")
@@ -434,6 +586,27 @@ def test_get_tensor_from_tensor_attrs(graph):
         assert feature_store.get_tensor(tensor_attr).tolist() == data.tolist()
 
 
+def test_get_tensor_after_create_named_tensor(graph):
+    pG = graph
+    feature_store, graph_store = to_pyg(pG, backend="cupy")
+
+    idx = cupy.array([0, 1, 2, 3, 4])
+    vertex_type = sorted(pG.vertex_types)[0]
+
+    with pytest.raises(ValueError):
+        feature_store.get_tensor(vertex_type, "prop1_only", idx)
+
+    feature_store.create_named_tensor(
+        "prop1_only", ["prop1"], vertex_type, cupy.float32
+    )
+    tsr = feature_store.get_tensor(vertex_type, "prop1_only", idx)
+
+    data = pG.get_vertex_data(
+        vertex_ids=cudf.Series(idx), types=vertex_type, columns=["prop1"]
+    )[["prop1"]].to_cupy(dtype=cupy.float32)
+    assert tsr.tolist() == data.tolist()
+
+
 def test_get_tensor_size(graph):
     pG = graph
     feature_store, graph_store = to_pyg(pG, backend="cupy")
@@ -506,6 +679,72 @@ def test_get_x_with_pre_renumber(graph):
             assert list(t) == list(b)
 
 
+def test_vertex_types_with_pre_renumber_out_of_insertion_order():
+    pG = PropertyGraph()
+    # "brown" is inserted before "black", so renumbering gives it the
+    # lower ids even though it sorts after "black"
+    pG.add_vertex_data(
+        cudf.DataFrame({"id": [0, 2, 4], "prop1": [1.0, 2.0, 3.0]}),
+        vertex_col_name="id",
+        type_name="brown",
+    )
+    pG.add_vertex_data(
+        cudf.DataFrame({"id": [1, 3], "prop1": [4.0, 5.0]}),
+        vertex_col_name="id",
+        type_name="black",
+    )
+    pG.add_edge_data(
+        cudf.DataFrame({"src": [0, 2], "dst": [1, 3]}),
+        vertex_col_names=["src", "dst"],
+        type_name="likes",
+    )
+    pG.add_edge_data(
+        cudf.DataFrame({"src": [1], "dst": [4]}),
+        vertex_col_names=["src", "dst"],
+        type_name="knows",
+    )
+    pG.renumber_vertices_by_type()
+
+    feature_store, graph_store = to_pyg(pG, backend="cupy", renumber_graph=False)
+
+    edge_types = sorted(attr.edge_type for attr in graph_store.get_all_edge_attrs())
+    assert edge_types == [("black", "knows", "brown"), ("brown", "likes", "black")]
+
+    brown_ids = pG.get_vertex_data(types=["brown"])[pG.vertex_col_name]
+    black_ids = pG.get_vertex_data(types=["black"])[pG.vertex_col_name]
+    noi = cudf.concat([brown_ids, black_ids]).sort_values()
+    noi_index = graph_store._get_vertex_groups_from_sample(noi)
+    assert noi_index["brown"].tolist() == sorted(brown_ids.values_host.tolist())
+    assert noi_index["black"].tolist() == sorted(black_ids.values_host.tolist())
+
+
+@pytest.mark.parametrize("pre_renumber", [False, True])
+def test_get_vertex_index(multi_edge_multi_vertex_property_graph_1, pre_renumber):
+    pG = multi_edge_multi_vertex_property_graph_1
+    if pre_renumber:
+        pG.renumber_vertices_by_type()
+        feature_store, graph_store = to_pyg(pG, backend="cupy", renumber_graph=False)
+    else:
+        feature_store, graph_store = to_pyg(pG, backend="cupy")
+
+    expected = {
+        vertex_type: sorted(
+            pG.get_vertex_data(types=[vertex_type])[
+                pG.vertex_col_name
+            ].values_host.tolist()
+        )
+        for vertex_type in pG.vertex_types
+    }
+
+    for vtypes in (["brown"], ["black"], ["brown", "black"], ["black", "brown"]):
+        index = graph_store.get_vertex_index(vtypes)
+        assert index.dtype == cupy.int64
+        assert index.tolist() == sum((expected[t] for t in vtypes), [])
+
+    assert graph_store.get_vertex_index("black").tolist() == expected["black"]
+    assert len(graph_store.get_vertex_index([])) == 0
+
+
 def test_get_x_bad_dtype(graph):
     pG = graph
     feature_store, graph_store = to_pyg(pG, backend="cupy")